@@ -14,16 +14,20 @@ import numpy as np
 import dataPython as dp
 import types
 import sys
+import os
+import traceback
 import scipy.integrate as si
 import scipy.optimize as so
 import scipy.special as ss
 import scipy.interpolate as inter
 from scipy.interpolate import InterpolatedUnivariateSpline      # Spline function
+from functools import lru_cache                                 # Caching
 import lmfit as lm                                              # Fitting
 from joblib import Parallel, delayed                           # Parallel processing
+from concurrent.futures import ThreadPoolExecutor              # Persistent worker threads
 
 # Custom libraries
-from load_galaxies import *
+import load_galaxies
 
 try:
     import h5py as h5
@@ -42,10 +46,45 @@ defaultpath = '../'
 :type: string
 """
 
+coredriver = False
+"""If `True`, files are opened for reading with HDF5's in-memory core driver, which reads the whole file into RAM at once instead of seeking for every piece of metadata. This pays off for large cache files; for the few-kilobyte files shipped here a plain open is slightly faster.
+
+:type: bool
+"""
+
+_datacache = {}
+"""In-memory copies of datasets already read by :func:`loaddata <components.loaddata>`, keyed by (absolute file path, group, dataset), so repeated loads do not reopen the file. An entry is dropped whenever :func:`savedata <components.savedata>` writes to the same dataset.
+
+:type: dict
+"""
+
+def _readdriver():
+    """
+    Keyword arguments for opening a file read-only, following :func:`coredriver <components.coredriver>`.
+
+    :returns:
+        [dict] Driver options for `h5py.File`.
+    """
+    
+    if coredriver:
+        return {'driver':'core', 'backing_store':False}
+    return {}
+
+def __getattr__(name):
+    """
+    Look up names not defined here in `load_galaxies.py <../load_galaxies/index.html>`_, so that galaxy dictionaries such as `components.NGC5533` remain available without star-importing every table into this namespace.
+    """
+    
+    try:
+        return vars(load_galaxies)[name]
+    except KeyError:
+        raise AttributeError("module 'components' has no attribute '"+name+"'") from None
+
 #===============================
 #========= Constants ===========
 #===============================
 
+@lru_cache(maxsize=None)
 def galdict(galaxy):
     """
     Retrieve a dictionary of parameters for the associated galaxy.
@@ -74,7 +113,21 @@ def galdict(galaxy):
         1.4
     """
     
-    return globals()[galaxy.upper().replace(" ","")]        
+    return vars(load_galaxies)[galaxy.upper().replace(" ","")]        
+
+def _asradius(r):
+    """
+    Convert radius values to a contiguous float64 array of at least one dimension, so that scalars, lists and strided slices all take the same unit-stride path through NumPy.
+
+    :parameters:
+        r : [float, list or array]
+            Radius values (:math:`kpc`).
+
+    :returns:
+        [array] The radius values as a contiguous float64 array. An array that already qualifies is returned without copying.
+    """
+
+    return np.ascontiguousarray(r, dtype=np.float64)
 
 # Defaults based on NGC5533
 
@@ -152,10 +205,82 @@ upsdisk = 5.0                     # Disk mass-to-light ratio. Source: Noordermee
 """
 #h_gamma = 0
 
+#---------Numerical Integration-------
+quadrature_order = 64
+"""Number of Gauss-Legendre nodes used for fixed-order integrals, namely both axes of the bulge integral. Change it with :func:`set_quadrature_order <components.set_quadrature_order>`.
+
+:type: int
+"""
+
+def set_quadrature_order(n):
+    """
+    Regenerate the cached Gauss-Legendre nodes and weights used for fixed-order integrals.
+
+    :parameters:
+        n : [int]
+            Number of quadrature nodes.
+
+    :returns:
+        `None`. Updates :func:`quadrature_order <components.quadrature_order>`, :func:`gl_nodes <components.gl_nodes>` and :func:`gl_weights <components.gl_weights>`.
+
+    :example:
+        >>> # Use a finer rule and recalculate the bulge of NGC 5533
+        >>> set_quadrature_order(128)
+        >>> print(bulge(r=10, bpref=1, galaxy='NGC5533', load=False))
+        [166.78931801]
+    """
+
+    global quadrature_order, gl_nodes, gl_weights
+    x, w = np.polynomial.legendre.leggauss(int(n))
+    quadrature_order = int(n)
+    gl_nodes = (x+1)/2                # Nodes scaled from [-1,1] to [0,1]
+    gl_weights = w/2
+
+gl_nodes = None
+"""Gauss-Legendre nodes on the interval [0,1].
+
+:type: array
+"""
+gl_weights = None
+"""Gauss-Legendre weights on the interval [0,1].
+
+:type: array
+"""
+set_quadrature_order(quadrature_order)
+
 ################################
 ########### Saving #############
 ################################
 
+_GROUP_ALIASES = {
+    'disk': 'disk', 'disc': 'disk', 'd': 'disk',
+    'blackhole': 'blackhole', 'black hole': 'blackhole', 'bh': 'blackhole',
+    'halo': 'halo', 'h': 'halo', 'dm': 'halo', 'dark matter': 'halo', 'darkmatter': 'halo',
+    'bulge': 'bulge', 'b': 'bulge',
+    'total': 'total', 't': 'total'
+}
+"""Alternative spellings of the standard group names, in lower case, mapped to the name used in the hdf5 files.
+
+:type: dict
+"""
+
+def _groupname(group):
+    """
+    Translate an alternative group name to the standard one, ignoring case. Names not found in :func:`_GROUP_ALIASES <components._GROUP_ALIASES>` are returned unchanged.
+
+    :parameters:
+        group : [string]
+            Name of a group within the hdf5 file.
+
+    :returns:
+        [string] The standard group name.
+    """
+
+    name = _GROUP_ALIASES.get(group.lower(), group)
+    if name != group:
+        print("Group name set to '"+name+"'.")
+    return name
+
 def savedata(xvalues,
              yvalues,
              group,
@@ -184,7 +309,7 @@ def savedata(xvalues,
 
             :default: "Inputs.hdf5".
 
-    :returns: `None` on success, `1` if h5py was not loaded, and an [array] of y-values if saving data failed and data was loaded instead.
+    :returns: `None` on success, `1` if h5py was not loaded, and the merged [array] of y-values if the dataset already existed and the new values were combined with it.
 
     :example:
         >>> x = [0,1,2,3]
@@ -197,44 +322,23 @@ def savedata(xvalues,
     """
     
     if h5py == 1:
-        saved = h5.File(path+'/'+file,'a')
-        if group.lower() in ['disc', 'disk',  'd']:
-            group = 'disk'
-            print("Group name set to 'disk'.")
-        if group.lower() in ['bh','black hole','blackhole']:
-            group = 'blackhole'
-            print("Group name set to 'blackhole'.")
-        if group.lower() in ['dm','dark matter','h','halo','darkmatter']:
-            group = 'halo'
-            print("Group name set to 'halo'.")
-        if group.lower() in ['b','bulge']:
-            group = 'bulge'
-            print("Group name set to 'bulge'.")
-        if group.lower() in ['t','total']:
-            group = 'total'
-            print("Group name set to 'total'.")
+        filepath = os.path.join(path,file)
+        saved = h5.File(filepath,'a')
+        group = _groupname(group)
+        _datacache.pop((os.path.abspath(filepath),group,dataset), None)   # Forget any copy loaded before this write
+        _loaded_spline.cache_clear()
         try:
-            grp = saved.create_group(group)
-            grp.create_dataset(dataset,data=[xvalues,yvalues])
-        except ValueError:
-            grp = saved[group]
-            grp.create_dataset(dataset,data=[xvalues,yvalues])
-        except RuntimeError:
-            x = loaddata(group,dataset,path,file)[0]
-            x = np.append(x,xvalues)
-            y = loaddata(group,dataset,path,file)[1]
-            y = np.append(y,yvalues)
-            x, y = (list(a) for a in zip(*sorted(zip(x, y))))
-            i = 0
-            while i < len(x)-1:
-                if x[i+1] == x[i]:
-                    x = np.delete(x,i+1)
-                    y = np.delete(y,i+1)
-                else:
-                    i += 1
-            del grp[dataset]
-            savedata(x,y,group,dataset,path,file)
-            return y
+            grp = saved.require_group(group)
+            if dataset in grp:
+                # Combine with the existing data, keeping the stored value wherever an x-value repeats
+                x = np.append(grp[dataset][0],xvalues)
+                y = np.append(grp[dataset][1],yvalues)
+                x, index = np.unique(x,return_index=True)   # Sorted, first occurrence of each x
+                y = y[index]
+                del grp[dataset]
+                grp.create_dataset(dataset,data=np.asarray([x,y]),chunks=None,track_times=False)
+                return y
+            grp.create_dataset(dataset,data=np.asarray([xvalues,yvalues]),chunks=None,track_times=False)   # Contiguous, no timestamps
         finally: # No matter what,
             saved.close()
         #print("Saved.") # Convenient for debugging but annoying for fitting.
@@ -264,7 +368,7 @@ def loaddata(group,
             
             :default: "Inputs.hdf5".
 
-    :returns: [array] on success or `1` if h5py was not loaded.        
+    :returns: [array] on success or `1` if h5py was not loaded. The array is read-only, since repeated loads of the same dataset return the same cached copy.
 
     :example:
         >>> x = [0,1,2,3]
@@ -277,25 +381,17 @@ def loaddata(group,
     """
     
     if h5py == 1:
-        saved = h5.File(path+'/'+file,'r')
-        if group in ['Disk', 'disc', 'Disc', 'd', 'D']:
-            group = 'disk'
-            print("Group name set to 'disk'.")
-        if group in ['bh','Bh','BH','Black Hole','BlackHole','Blackhole,','Black hole','black hole','Black Hole']:
-            group = 'blackhole'
-            print("Group name set to 'blackhole'.")
-        if group in ['dm','DM','Dm','Dark Matter','Dark matter','dark matter','h','H','Halo','darkmatter','Darkmatter','Dark Matter']:
-            group = 'halo'
-            print("Group name set to 'halo'.")
-        if group in ['b','B','Bulge']:
-            group = 'bulge'
-            print("Group name set to 'bulge'.")
-        if group in ['t','T','Total']:
-            group = 'total'
-            print("Group name set to 'total'.")
-        grp = saved[group]
-        dset = grp[dataset]
-        a = dset[:]
+        group = _groupname(group)
+        filepath = os.path.join(path,file)
+        key = (os.path.abspath(filepath),group,dataset)
+        if key in _datacache:
+            return _datacache[key]
+        with h5.File(filepath,'r',**_readdriver()) as saved:     # No matter what, close the file when you're done
+            grp = saved[group]
+            dset = grp[dataset]
+            a = dset[:]
+        a.setflags(write=False)             # Shared with later calls, so protect it from in-place changes
+        _datacache[key] = a
         return a
     
     # Placeholder; I will design this to store information at a later date.
@@ -303,9 +399,6 @@ def loaddata(group,
         print("ERROR: h5py was not loaded.")
         return 1
     
-    # No matter what, close the file when you're done
-    saved.close() 
-    
 ##Utility function for checking data present in hdf5 without loading.
 #**Arguments:** `group` (string, optional), `path` (string, optional), `file` (string, optional)
 #
@@ -343,35 +436,22 @@ def checkfile(group='all',
         >>> savedata(x,y,'test','example')
         >>> checkfile()
         Groups:
-        <HDF5 group "/test" (1 members)>
-        ----------------
-        More information:
         <HDF5 group "/test" (1 members)>
                 <HDF5 dataset "example": shape (2, 4), type "<i8">
 
     """
     
     if h5py == 1:
-        saved = h5.File(path+'/'+file,'r')
-        if group == 'all':
-            print('Groups:')
-            for n in saved:
-                print(saved[n])
-            print('')
-            print(' ---------------- ')
-            print('')
-            print('More information:')
-            for n in saved:
-                grp = saved[n]
-                print(grp)
-                for m in grp:
-                    print('        '+str(grp[m]))
-        else:
-            print(group+':')
-            grp = saved[group]
-            for n in grp:
-                print(grp[n])
-        saved.close()
+        with h5.File(os.path.join(path,file),'r',**_readdriver()) as saved:
+            # Print every group and dataset in one traversal, indented by depth
+            show = lambda name, obj: print('        '*name.count('/')+str(obj))
+            if group == 'all':
+                print('Groups:')
+                saved.visititems(show)
+            else:
+                group = _groupname(group)
+                print(group+':')
+                saved[group].visititems(show)
         
     elif h5py == 0:
         print("ERROR: h5py was not loaded.")
@@ -417,33 +497,46 @@ def blackhole(r,
     comp = 'blackhole'
     
     # Convert to an array
-    if isinstance(r,float) or isinstance(r,int):
-        r = np.asarray([r])
-    if isinstance(r,list):
-        r = np.asarray(r)
+    r = _asradius(r)
         
     # Rotational velocity due to a point mass (M)
     a = np.sqrt(G*M/r)
     
+    # Name of the dataset for this mass
+    key = f'Mbh{M}'
+    
+    # Loading only tells whether this mass is already stored, since the velocity above is exact
+    if load and not save:
+        try:
+            loaddata(comp,key,file=f'{comp}.hdf5')
+        except (KeyError, FileNotFoundError): # If unable to load, save
+            save = True
+            
     # Saving
     if save:
-        load = False
+        savedata(r,a,comp,key,file=f'{comp}.hdf5')
         
-    # Loading
-    if load:
-        try: # Load existing prefactor if available
-            y = loaddata(comp,'Mbh'+str(M),file=comp+'.hdf5')[1]
-            x = loaddata(comp,'Mbh'+str(M),file=comp+'.hdf5')[0]
-        except KeyError: # If unable to load, save
-            save = True
-        except FileNotFoundError:
-            save = True
-    if save:
-        savedata(r,a,comp,'Mbh'+str(M),file=comp+'.hdf5')
-        return a
-    else:
-        return a
+    return a
+    
+@lru_cache(maxsize=64)
+def _sersic_bn(n):
+    """
+    Find the Sersic constant :math:`b_n`, the root of :math:`\\gamma(2n,b_n)=\\Gamma(2n)/2`, once per concentration parameter.
+
+    :parameters:
+        n : [float]
+            Concentration parameter (unitless).
+
+    :returns:
+        [float] :math:`b_n` (unitless).
+    """
+
+    # Gamma function
+    b_gammafunc = lambda x: ss.gammainc(2*n,x)*ss.gamma(2*n)-0.5*ss.gamma(2*n)
     
+    # Find the root of the gamma function for fixed parameters
+    return so.brentq(b_gammafunc,0,500000,rtol=0.000001,maxiter=100) # come within 1% of exact root within 100 iterations
+
 def bulge(r,
           bpref,
           galaxy,
@@ -495,6 +588,70 @@ def bulge(r,
         [166.78929909] 
     """    
     
+    # Convert single values to an array (interpolate)
+    r = _asradius(r)
+    
+    # Spline of the unscaled bulge, built once per galaxy and set of parameters
+    polynomial = _bulge_spline(galaxy.upper().replace(" ",""),n,re,load,save,comp,quadrature_order,**kwargs)
+    
+    return bpref*polynomial(r)
+
+def _bulge_spline(galaxy,
+                  n,
+                  re,
+                  load,
+                  save,
+                  comp,
+                  order,
+                  **kwargs):
+    """
+    Load or calculate the spline of the unscaled bulge curve of a galaxy for :func:`bulge <components.bulge>`. 
+    Loaded splines come from :func:`_loaded_spline <components._loaded_spline>` and calculated ones from :func:`_calculated_bulge <components._calculated_bulge>`; both are cached, but the file is only read or written here, so saving always writes and loading sees the latest file.
+
+    :parameters:
+        galaxy : [string]
+            The galaxy's name, already upper-case and without spaces. 
+        n, re, load, save, comp, \\*\\*kwargs : 
+            As in :func:`bulge <components.bulge>`.
+        order : [int]
+            Current :func:`quadrature_order <components.quadrature_order>`, so that changing it makes a new calculation.
+
+    :returns:
+        [scipy.interpolate.InterpolatedUnivariateSpline] Quintic spline of the bulge velocities for `bpref=1` (:math:`km/s`).
+    """
+    
+    if galaxy == 'NGC5533':
+        # Name of the dataset for these parameters, from the luminosity of the bulge
+        L = galdict(galaxy)['bulge']['Lb']
+        key = f'L{L}n{n}re{re}'
+        if load:
+            try: #load if exists
+                return _loaded_spline(comp,key,file=f'{comp}.hdf5',**kwargs)
+            except KeyError: #if does not exist,
+                save = True  #go to save function instead
+            except FileNotFoundError:
+                save = True
+        if save:
+            savedata(galdict(galaxy)['m_radii'],_calculated_bulge(galaxy,n,re,order)[0],comp,key,file=f'{comp}.hdf5',**kwargs)
+    
+    return _calculated_bulge(galaxy,n,re,order)[1]
+
+@lru_cache(maxsize=64)
+def _calculated_bulge(galaxy,
+                      n,
+                      re,
+                      order):
+    """
+    Calculate the unscaled bulge curve of a galaxy and build its spline once per set of parameters, for :func:`_bulge_spline <components._bulge_spline>`.
+
+    :parameters:
+        galaxy, n, re, order : 
+            As in :func:`_bulge_spline <components._bulge_spline>`.
+
+    :returns:
+        [tuple] The read-only [array] of bulge velocities at the measured radii (:math:`km/s`) and its quintic [scipy.interpolate.InterpolatedUnivariateSpline], both for `bpref=1`.
+    """
+    
     # Define galaxy name
     galdict_local = galdict(galaxy)
     
@@ -504,89 +661,58 @@ def bulge(r,
     # Get luminosity of bulge
     L = galdict_local['bulge']['Lb']
     
-    # Gamma function
-    b_gammainc = lambda x, n: ss.gammainc(2*n,x)*ss.gamma(2*n)-0.5*ss.gamma(2*n)
-    
-    b_gammafunc = lambda x: ss.gammainc(2*n,x)*ss.gamma(2*n)-0.5*ss.gamma(2*n)
-    
-    # Find the root of the gamma function for fixed parameters
-    b_root = so.brentq(b_gammafunc,0,500000,rtol=0.000001,maxiter=100) # come within 1% of exact root within 100 iterations
-    
-    # Calculate central surface brightness
-    b_I0 = lambda L, n, re: L*(b_root**(2*n))/(re**2*2*np.pi*n*ss.gamma(2*n))
-    
-    # Calculate characteristic radius
-    b_r0 = lambda n, re: re/np.power(b_root,n)
-    
-    # Inner function
-    b_innerf = lambda x, m, n, re: np.exp(-np.power(x/b_r0(n,re), (1/n)))*np.power(x/b_r0(n,re), 1/n-1)/(np.sqrt(x**2-m**2))
-    
-    # Integrate inner function
-    b_innerintegral = lambda m, n, re: si.quad(b_innerf, m, np.inf,args=(m,n,re))[0]
+    # Root of the gamma function for fixed parameters
+    b_root = _sersic_bn(n)
     
-    # Vectorize
-    b_innerintegralv = np.vectorize(b_innerintegral)
-    
-    # Define a constant C
-    C = lambda n, re: (4*G*q*ups*b_I0(L,n,re))/(b_r0(n,re)*np.float(n))*(np.sqrt((np.sin(i)**2)+(1/(q**2))*(np.cos(i)**2)))
-    
-    # Define whole function
-    b_function = lambda m, r, n, re: C(n,re)*b_innerintegral(m,n,re)*(m**2)/(np.sqrt((r**2)-((m**2)*(e2))))
-    
-    # Define parallel integration function for bulge calculation
-    def _bulge_integration_parallel(r_val, L, n, re):
-        """Helper function for parallel bulge integration"""
-        try:
-            return si.quad(b_function, 0, r_val, args=(r_val,n,re))[0]
-        except Exception as e:
-            print(f"Warning: Bulge integration failed for r={r_val}: {e}")
-            return 0.0
-    
-    # Integrate outer function and obtain velocity squared
-    b_vsquare = lambda r, L, n, re: si.quad(b_function, 0, r, args=(r,n,re))[0]
-    
-    # Parallel vectorized version (2-8x speedup for bulge calculations)
-    def b_vquarev_parallel(r_array, L, n, re):
-        """Parallel version of bulge velocity calculation"""
-        if isinstance(r_array, (int, float)):
-            r_array = np.array([r_array])
-        
-        # Use parallel processing for multiple radius points
-        results = Parallel(n_jobs=-1, prefer="threads")(
-            delayed(_bulge_integration_parallel)(r_val, L, n, re) 
-            for r_val in r_array
-        )
-        return np.array(results)
-    
-    # Vectorize (keep original for backward compatibility)
-    b_vquarev = lambda r, L, n, re: np.vectorize(b_vsquare)
+    # Fixed for these parameters, so computed once instead of inside every integrand evaluation
+    n = float(n)
+    inv_n = 1/n
+
+    # Characteristic radius
+    r0 = re/np.power(b_root,n)
+
+    # Central surface brightness
+    I0 = L*(b_root**(2*n))/(re**2*2*np.pi*n*ss.gamma(2*n))
+
+    # Constant in front of the integral
+    Cc = (4*G*q*ups*I0)/(r0*n)*(np.sqrt((np.sin(i)**2)+(1/(q**2))*(np.cos(i)**2)))
+
+    # Inner function, substituting x = m*cosh(s) to remove the singularity at x = m
+    def b_innerf(s, m):
+        x = m*np.cosh(s)/r0
+        return np.exp(-np.power(x,inv_n))*np.power(x,inv_n-1)
+
+    # Upper limit of s, where the exponent (x/r0)^(1/n) has grown by 40 past its value at x = m and the integrand is negligible
+    b_smax = lambda m: np.arccosh(r0*np.power(np.power(m/r0,inv_n)+40,n)/m)
+
+    # Integrate inner function on the cached Gauss-Legendre nodes, scaled to [0,smax], for an array of m
+    def b_innerintegral(m):
+        smax = b_smax(m)
+        return smax*(b_innerf(smax[...,None]*gl_nodes,m[...,None]) @ gl_weights)
+
+    # The inner integral depends on m alone, so tabulate it once on a log-spaced grid and spline it in log-log space
+    # rather than integrating it again at every (r,u) pair; 8 points per outer node keep the relative error near 1e-8
+    def b_innertable(m):
+        positive = m[m > 0]
+        m_grid = np.geomspace(positive.min(),positive.max(),8*gl_nodes.size)
+        logspline = InterpolatedUnivariateSpline(np.log(m_grid),np.log(b_innerintegral(m_grid)),k=3)
+        return np.exp(logspline(np.log(m)))
+
+    # Define whole function, substituting m = r*u so every radius shares the interval [0,1]
+    b_function = lambda u, r: b_innertable(np.outer(r,u))*(u**2)/(np.sqrt(1-(u**2)*e2))
+
+    # Integrate outer function on the cached Gauss-Legendre nodes for all radii at once and obtain velocity squared
+    b_vsquarev = lambda r: Cc*(r**2)*(b_function(gl_nodes,r) @ gl_weights)
     
-    # Convert single values to an array (interpolate)
-    if isinstance(r,float) or isinstance(r,int): 
-        r = np.asarray([r])
-    if galaxy.upper() == 'NGC7814':
-        y = galdict_local['bulge']['v']
-    elif galaxy.upper() == 'NGC5533':
-        if load:
-            try: #load if exists
-                y = loaddata(comp,'L'+str(L)+'n'+str(n)+'re'+str(re),file=comp+'.hdf5',**kwargs)[1]
-                polynomial = InterpolatedUnivariateSpline(r_dat,bpref*y,k=5) #k is the order of the polynomial
-                return polynomial(r)
-            except KeyError: #if does not exist,
-                save = True  #go to save function instead
-            #except: #Attempting to catch problem with spline having too few points
-             #   print('An error has occured. Switching to save function.')
-              #  save = True #Calculate since there aren't enough points
-        # Use parallel version for better performance (2-8x speedup)
-        y = b_vquarev_parallel(r_dat,L,n,re)**(1/2)
+    if galaxy == 'NGC7814':
+        y = np.array(galdict_local['bulge']['v'],dtype=float)
+    elif galaxy == 'NGC5533':
+        y = b_vsquarev(np.asarray(r_dat,dtype=float))**(1/2)
         y[np.isnan(y)] = 0
-        if save:
-            savedata(r,y,comp,'L'+str(L)+'n'+str(n)+'re'+str(re),file=comp+'.hdf5',**kwargs)
+    y.setflags(write=False)
     
     # Define polynomial
-    polynomial = InterpolatedUnivariateSpline(r_dat,bpref*y,k=5)
-    
-    return polynomial(r)
+    return y, InterpolatedUnivariateSpline(r_dat,y,k=5)
 
 def disk(r,
          dpref,
@@ -612,6 +738,21 @@ def disk(r,
         147.62309536730015
     """   
     
+    return dpref*_disk_spline(galaxy.upper().replace(" ",""))(r)
+
+@lru_cache(maxsize=None)
+def _disk_spline(galaxy):
+    """
+    Build the unscaled disk spline of a galaxy once and keep it for later calls of :func:`disk <components.disk>`.
+
+    :parameters:
+        galaxy : [string]
+            The galaxy's name, already upper-case and without spaces. 
+
+    :returns:
+        [scipy.interpolate.BSpline] Quintic interpolating spline of the traced disk velocities (:math:`km/s`).
+    """
+
     # Define galaxy name
     galdict_local = galdict(galaxy)
     
@@ -620,13 +761,12 @@ def disk(r,
     v_dat = galdict_local['disk']['v']
     
     # Interpolate
-    if galaxy.upper() == 'NGC7814':
-        polynomial = InterpolatedUnivariateSpline(r_dat,dpref*galdict_local['disk']['v'],k=5)   
-    elif galaxy.upper() == 'NGC5533':
+    if galaxy == 'NGC7814':
+        x = r_dat
+    elif galaxy == 'NGC5533':
         x = galdict_local['disk']['r']
-        polynomial = InterpolatedUnivariateSpline(x,dpref*v_dat,k=5)           # k is the order of the polynomial
         
-    return polynomial(r)
+    return inter.BSpline(*inter.splrep(x,v_dat,k=5))          # k is the order of the polynomial
 
 def gas(r,
         gpref,
@@ -652,6 +792,21 @@ def gas(r,
         22.824681427585002
     """  
     
+    return gpref*_gas_spline(galaxy.upper().replace(" ",""))(r)
+
+@lru_cache(maxsize=None)
+def _gas_spline(galaxy):
+    """
+    Build the unscaled gas spline of a galaxy once and keep it for later calls of :func:`gas <components.gas>`.
+
+    :parameters:
+        galaxy : [string]
+            The galaxy's name, already upper-case and without spaces. 
+
+    :returns:
+        [scipy.interpolate.BSpline] Quintic interpolating spline of the traced gas velocities (:math:`km/s`).
+    """
+
     # Define galaxy name
     galdict_local = galdict(galaxy)
 
@@ -661,16 +816,40 @@ def gas(r,
     
     # Interpolate
     if galaxy.upper() == 'NGC7814':
-        polynomial = InterpolatedUnivariateSpline(r_dat,gpref*galdict_local['gas']['v'],k=5)   
+        x = r_dat
     elif galaxy.upper() == 'NGC5533':
         x = galdict_local['gas']['r']
-        polynomial = InterpolatedUnivariateSpline(x,gpref*v_dat,k=5)             # k is the order of the polynomial   
         
-    return polynomial(r)
+    return inter.BSpline(*inter.splrep(x,v_dat,k=5))          # k is the order of the polynomial
 
 #############################################
 ### Calculating Dark Matter Halo Velocity ###
 #############################################
+
+def _one_minus_arctan_ratio(x):
+    """
+    Evaluate :math:`1-\\arctan(x)/x`, the profile shared by the isothermal enclosed masses, without cancellation at small `x`.
+
+    :parameters:
+        x : [array]
+            Radius in units of the core radius (unitless).
+
+    :returns:
+        [array] :math:`1-\\arctan(x)/x`. Below :math:`x=0.1` the Taylor series :math:`x^2/3-x^4/5+x^6/7-\\dots` is summed in Horner form, which is exact to double precision there and gives `0` at `x=0`.
+    """
+
+    x = np.asarray(x, dtype=np.float64)
+    x2 = x*x
+    small = np.abs(x) < 0.1
+    
+    # Taylor series through x^16, truncation error below 1e-17 relative
+    series = x2*(1/3 - x2*(1/5 - x2*(1/7 - x2*(1/9 - x2*(1/11 - x2*(1/13 - x2*(1/15 - x2/17)))))))
+    
+    # Closed form elsewhere; small x are replaced by 1 here so that x=0 is never divided by
+    x_safe = np.where(small, 1, x)
+    direct = 1 - np.arctan(x_safe)/x_safe
+    
+    return np.where(small, series, direct)
     
 # Calculating the velocity for each black hole as a point mass for `10_Bonus_Black_Holes_as_DM.ipynb <https://github.com/villano-lab/galactic-spin-W1/blob/master/binder/10_Bonus_Black_Holes_as_DM.ipynb>`_ notebook
 def halo_BH(r,
@@ -694,7 +873,7 @@ def halo_BH(r,
             Cutoff radius (:math:`kpc`). 
 
     :returns:
-        A float or an array of splined halo velocities (:math:`km/s`).
+        A float or an array of halo velocities (:math:`km/s`).
 
     .. note::
         This function is only for the case when the dark matter halo consists of tiny black holes, as described in the `10_Bonus_Black_Holes_as_DM.ipynb <https://github.com/villano-lab/galactic-spin-W1/blob/master/binder/10_Bonus_Black_Holes_as_DM.ipynb>`_ notebook. 
@@ -709,27 +888,46 @@ def halo_BH(r,
         3.13683133 3.15349481 3.16603213 3.17580667 3.18364085 3.21905242]
     """  
     
-    # Sort radii
-    x = np.sort(r)
+    r = _asradius(r)
     
     # Mass as a function of radius with massMiniBH (mass of black holes for slider) being equivalent to rho0 (central mass density)
     # Source: Jimenez et al. 2003
-    mass_r = lambda r: 4 * np.pi * massMiniBH * rcut**2  * (r - rcut * (np.arctan(r/rcut)))
-    
-    # Define velocity
-    y = np.sqrt((G * (scale * arraysize) * mass_r(r)) / r)   
-                    # scale is needed to be separate and constant because the widget would freeze the computer otherwise
-                    # arraysize is the number of black holes for slider
-            
-    # Interpolate        
-    halo = InterpolatedUnivariateSpline(x,y,k=5)
-    
-    return halo(r)
+    # M(r) = 4 pi massMiniBH rcut^2 (r - rcut arctan(r/rcut))
+    
+    # Scalar prefactor, collected once so only the radial term allocates
+    # scale is needed to be separate and constant because the widget would freeze the computer otherwise
+    # arraysize is the number of black holes for slider
+    prefactor = G * (scale * arraysize) * 4 * np.pi * massMiniBH * rcut**2
+    
+    # Define velocity, using M(r)/r = 4 pi massMiniBH rcut^2 (1 - arctan(r/rcut)/(r/rcut)), which is 0 at r=0
+    # The closed form is exact at every radius, so no spline is needed and the caller's ordering of r is kept
+    y = _one_minus_arctan_ratio(r/rcut)
+    y *= prefactor
+    np.maximum(y, 0, out=y)
+    return np.sqrt(y, out=y)
+
+@lru_cache(maxsize=256)
+def _loaded_spline(group,
+                   dataset,
+                   **kwargs):
+    """
+    Build a spline through a dataset saved with :func:`savedata <components.savedata>` once and keep it for later calls. The cache is cleared whenever data is saved.
+
+    :parameters:
+        group, dataset, \\*\\*kwargs : 
+            As in :func:`loaddata <components.loaddata>`.
+
+    :returns:
+        [scipy.interpolate.InterpolatedUnivariateSpline] Quintic spline through the saved x- and y-values.
+    """
+
+    xy = loaddata(group,dataset,**kwargs)
+    return InterpolatedUnivariateSpline(xy[0],xy[1],k=5)          # k is the order of the polynomial
 
 def h_viso(r,
            rc=galdict('NGC5533')['rc'],
            rho00=galdict('NGC5533')['rho0'],
-           load=True,
+           load=False,
            save=False,
            comp='halo',
            **kwargs):   #h_v iso
@@ -749,7 +947,9 @@ def h_viso(r,
             :default: `0.31e9`
         load : [bool] 
             Whether or not to load data from a file. If no data can be loaded, it will be saved for future use instead. 
-            :default: `True`.
+            The closed form is cheaper than reading and splining a saved table, so this is only useful for reproducing saved data.
+
+            :default: `False`.
         save : [bool] 
             Whether or not to save data to a file. If data is already present, it will be combined with any new data to expand the dataset.
 
@@ -762,7 +962,7 @@ def h_viso(r,
             Additionaly key-word arguments to be passed to :func:`loaddata <components.loaddata>` or :func:`savedata <components.savedata>` if they are used.
 
     :returns:
-        A float or an array of splined halo velocities (:math:`km/s`).
+        A float or an array of halo velocities (:math:`km/s`), splined from saved data if it was loaded.
 
     :example:
         >>> # Calculate the gravitational effect of the Dark Matter halo 
@@ -770,33 +970,21 @@ def h_viso(r,
         >>> print(h_viso(r=np.array([10,15,20,25,30,35,40,45,50,100]), 
                          rc=(co.galdict('NGC5533')['rc']), 
                          rho00=(co.galdict('NGC5533')['rho0'])))
-        [-5.50269408e-15  1.68254755e+02  1.71431272e+02  1.73358219e+02 
-        1.74651377e+02  1.75579160e+02  1.76277209e+02  1.76821432e+02  
-        1.77257621e+02  1.79229253e+02]
+        [162.03918498 168.2547549  171.43127236 173.35821904 174.65137711
+        175.57916017 176.27720854 176.82143175 177.25762058 179.22925324]
     """  
     
     # If r isn't array-like, make it array-like
-    if isinstance(r,float) or isinstance(r,int): 
-        r = np.asarray([r])
-    
-    # Vectorized calculation (replaces the manual loop for 5-10x speedup)
-    # Handle r=0 case to avoid division by zero
-    r_safe = np.where(r == 0, np.finfo(float).eps, r)  # Replace 0 with tiny number
-    a = np.sqrt(4*np.pi*G*rho00*(rc**2)*(1-((rc/r_safe)*np.arctan(r_safe/rc))))
+    r = _asradius(r)
     
-    # Set r=0 results to 0 (physically correct)
-    a = np.where(r == 0, 0, a)
-    
-    # Handle any remaining NaN values
-    a[np.isnan(a)] = 0
+    # Name of the dataset for these parameters
+    key = f'rc{rc}rho00{rho00}'
     
     # Loading data
     if load:
         # Load if exists
         try: 
-            y = loaddata(comp,'rc'+str(rc)+'rho00'+str(rho00),file=comp+'.hdf5',**kwargs)[1]
-            x = loaddata(comp,'rc'+str(rc)+'rho00'+str(rho00),file=comp+'.hdf5',**kwargs)[0]
-            b = InterpolatedUnivariateSpline(x,y,k=5)          # k is the order of the polynomial
+            b = _loaded_spline(comp,key,file=f'{comp}.hdf5',**kwargs)
             return b(r)
         
         # If does not exist,
@@ -821,12 +1009,18 @@ def h_viso(r,
             print()
             save = True         # Calculate since there aren't enough points
             
+    # Vectorized calculation (replaces the manual loop for 5-10x speedup)
+    # The series form of 1 - arctan(x)/x is exact near and at r=0, where the velocity is 0
+    a = np.sqrt(np.maximum(4*np.pi*G*rho00*(rc**2)*_one_minus_arctan_ratio(r/rc), 0))   # Clip negative densities to zero
+    
+    # Handle any remaining NaN values
+    a[np.isnan(a)] = 0
+    
     # Saving data
     if save:
-        savedata(r,a,comp,'rc'+str(rc)+'rho00'+str(rho00),file=comp+'.hdf5',**kwargs)
-        return a
-    else:
-        return a
+        savedata(r,a,comp,key,file=f'{comp}.hdf5',**kwargs)
+        
+    return a
 
 def halo(r,
          rc,
@@ -858,31 +1052,69 @@ def halo(r,
     return h_viso(r,rc,rho00,load=False)
 
 ##################################
-### Parallel Component Helper ###
+### Adding Components Together ###
 ##################################
 
-def _compute_component_parallel(component_func, r, *args, **kwargs):
+parallelcomponents = True
+"""If `True`, the components summed by :func:`totalvelocity_halo <components.totalvelocity_halo>` and :func:`totalvelocity_miniBH <components.totalvelocity_miniBH>` are evaluated on a pool of worker threads that is created once and reused, as long as there are at least :func:`parallelthreshold <components.parallelthreshold>` radii. NumPy releases the GIL in its kernels, so this can help for very large radius arrays. If `False`, components are always evaluated in turn.
+
+:type: bool
+"""
+
+parallelthreshold = 10000
+"""Smallest number of radii for which :func:`parallelcomponents <components.parallelcomponents>` takes effect. Below it the five components finish sooner in turn than it takes to hand them to worker threads, which covers every rotation curve and widget here.
+
+:type: int
+"""
+
+_threadpool = None
+"""Worker threads for :func:`parallelcomponents <components.parallelcomponents>`, created on first use.
+
+:type: concurrent.futures.ThreadPoolExecutor
+"""
+
+def _evaluate_components(tasks, size):
     """
-    Helper function to compute a single component in parallel.
+    Evaluate component functions, on the persistent thread pool if :func:`parallelcomponents <components.parallelcomponents>` is set and `size` reaches :func:`parallelthreshold <components.parallelthreshold>`, and in turn otherwise.
     
     :parameters:
-        component_func : [function]
-            The component function to compute (bulge, disk, halo, etc.)
-        r : [array]
-            Radius values
-        *args : arguments to pass to component_func
-        **kwargs : keyword arguments to pass to component_func
+        tasks : [list]
+            Pairs of a component function and the tuple of arguments to call it with.
+        size : [int]
+            Number of radii the components are evaluated at.
             
     :returns:
-        Array of component velocities squared
+        [list] The component velocities, in the order of `tasks`.
     """
-    try:
-        result = component_func(r, *args, **kwargs)
-        return result**2
-    except Exception as e:
-        # If parallel computation fails, return zeros to avoid crashes
-        print(f"Warning: Component computation failed: {e}")
-        return np.zeros_like(r)
+    global _threadpool
+    if not parallelcomponents or size < parallelthreshold:
+        return [function(*args) for function, args in tasks]
+    if _threadpool is None:
+        _threadpool = ThreadPoolExecutor(max_workers=len(tasks))
+    futures = [_threadpool.submit(function, *args) for function, args in tasks]
+    return [future.result() for future in futures]
+
+def _add_in_quadrature(components, scratch=None):
+    """
+    Add component velocities in quadrature, squaring each into one scratch buffer and accumulating in place, so that no intermediate array is built per component.
+    
+    :parameters:
+        components : [list]
+            Arrays of component velocities, all of the same shape.
+        scratch : [array]
+            Float buffer of that shape to square the components into, so that repeated calls can reuse it. Only the returned array is newly allocated.
+            
+            :default: `None`, a new buffer.
+            
+    :returns:
+        Array of total velocities
+    """
+    total = np.zeros(np.shape(components[0]))
+    square = np.empty_like(total) if scratch is None or scratch.shape != total.shape else scratch
+    for v in components:
+        np.multiply(v, v, out=square)
+        total += square
+    return np.sqrt(total, out=total)
 
 ##################################
 ### Calculating total velocity ###
@@ -940,18 +1172,15 @@ def totalvelocity_miniBH(r,
         182.85803424 174.3309731  165.72641622 158.01875262 114.03919935]
     """ 
     
-    # Parallel computation of components (2-4x speedup)
-    components_squared = Parallel(n_jobs=-1, prefer="threads")(
-        [
-            delayed(_compute_component_parallel)(blackhole, r, Mbh),
-            delayed(_compute_component_parallel)(bulge, r, bpref, galaxy),
-            delayed(_compute_component_parallel)(disk, r, dpref, galaxy),
-            delayed(_compute_component_parallel)(halo_BH, r, scale, arraysize, massMiniBH, rcut),
-            delayed(_compute_component_parallel)(gas, r, gpref, galaxy)
-        ]
-    )
+    r = _asradius(r)
     
-    return np.sqrt(sum(components_squared))
+    # Each component is a handful of vectorized NumPy operations, evaluated in turn unless there are enough radii to pay for threads
+    return _add_in_quadrature(_evaluate_components([(blackhole,(r,Mbh)),
+                                                    (bulge,(r,bpref,galaxy)),
+                                                    (disk,(r,dpref,galaxy)),
+                                                    (halo_BH,(r,scale,arraysize,massMiniBH,rcut)),
+                                                    (gas,(r,gpref,galaxy))],
+                                                   r.size))
     
 def totalvelocity_halo(r,
                        scale,
@@ -1002,23 +1231,111 @@ def totalvelocity_halo(r,
         253.48601074 247.90102596 242.32411768 237.44484552 212.40927924]
     """
     
-    # Parallel computation of components (2-4x speedup)
-    components_squared = Parallel(n_jobs=-1, prefer="threads")(
-        [
-            delayed(_compute_component_parallel)(blackhole, r, Mbh),
-            delayed(_compute_component_parallel)(bulge, r, bpref, galaxy),
-            delayed(_compute_component_parallel)(disk, r, dpref, galaxy),
-            delayed(_compute_component_parallel)(halo, r, rcut, rho00),
-            delayed(_compute_component_parallel)(gas, r, gpref, galaxy)
-        ]
-    )
-    
-    return np.sqrt(sum(components_squared))
+    r = _asradius(r)
+    
+    # Each component is a handful of vectorized NumPy operations, evaluated in turn unless there are enough radii to pay for threads
+    return _add_in_quadrature(_evaluate_components([(blackhole,(r,Mbh)),
+                                                    (bulge,(r,bpref,galaxy)),
+                                                    (disk,(r,dpref,galaxy)),
+                                                    (halo,(r,rcut,rho00)),
+                                                    (gas,(r,gpref,galaxy))],
+                                                   r.size))
+
+def totalvelocity_halo_batch(r,
+                             theta,
+                             galaxy):
+    """
+    Function to calculate the total velocity of :func:`totalvelocity_halo <components.totalvelocity_halo>` for many sets of parameters at once, for example parameter sweeps or bootstrap samples.
+    The unscaled bulge, disk and gas curves do not depend on the parameters, so they are evaluated once and scaled for every set, while the black hole and halo terms are broadcast over all sets in one pass.
+
+    :parameters:
+        r : [array]
+            Radius values or distance from the center of the galaxy used to calculate velocities (:math:`kpc`).
+        theta : [array]
+            Parameters with shape `(K, 8)`, one row `scale, arraysize, rho00, rcut, bpref, dpref, gpref, Mbh` per set, as in :func:`totalvelocity_halo <components.totalvelocity_halo>`. `scale` and `arraysize` are not used by this model. 
+        galaxy : [string]
+            The galaxy's full name, including catalog, for loading traced curves. Not case-sensitive. Ignores spaces. 
+
+    :returns:
+        [array] Total velocities with shape `(K, len(r))` (:math:`km/s`).
+
+    :example:
+        >>> # Total velocity for two central black hole masses
+        >>> theta = np.array([[0, 0, 0.31e9, 1.4, 1, 1, 1, 1000],
+        ...                   [0, 0, 0.31e9, 1.4, 1, 1, 1, 2.7e9]])
+        >>> print(totalvelocity_halo_batch(np.array([10,20,50]), theta, 'NGC5533')[:,0])
+        [276.38544202 278.47828969]
+    """
+    
+    r = _asradius(r)
+    theta = np.atleast_2d(np.asarray(theta, dtype=np.float64))
+    rho00, rcut, bpref, dpref, gpref, Mbh = (theta[:,k,None] for k in range(2,8))
+    
+    # Velocity squared of the black hole and halo, broadcast over parameter sets
+    total = G*Mbh/r
+    halo2 = 4*np.pi*G*rho00*(rcut**2)*_one_minus_arctan_ratio(r/rcut)
+    np.maximum(halo2, 0, out=halo2)
+    total += halo2
+    
+    # Unscaled traced and integrated curves, shared by every parameter set
+    for pref, v in ((bpref, bulge(r,1,galaxy)), (dpref, disk(r,1,galaxy)), (gpref, gas(r,1,galaxy))):
+        total += (pref*pref)*(v*v)
+        
+    return np.sqrt(total, out=total)
   
 #################################
 #### Find Fitting Parameters ####
 #################################
 
+def _halokind(model):
+    """
+    Tell which kind of halo a fitting model describes, by identity rather than by building lmfit models to compare against.
+
+    :parameters:
+        model : [string, function or lmfit.Model]
+            `'bh'`, `'wimp'`, a total velocity function, or an lmfit model wrapping one.
+
+    :returns:
+        [string] `'bh'` for :func:`totalvelocity_miniBH <components.totalvelocity_miniBH>`, `'wimp'` for :func:`totalvelocity_halo <components.totalvelocity_halo>`, and `None` for anything else.
+    """
+    
+    if isinstance(model, lm.Model):
+        model = model.func
+    if isinstance(model, str):
+        return model if model in ('bh', 'wimp') else None
+    if model is totalvelocity_miniBH:
+        return 'bh'
+    if model is totalvelocity_halo:
+        return 'wimp'
+    return None
+
+def _set_halo_params(fit_pars,
+                     model,
+                     galdict_local):
+    """
+    Add the halo parameters `arraysize` and `rho0` that match the kind of halo in `model`, for :func:`set_params <components.set_params>` and :func:`bestfit <components.bestfit>`.
+
+    :parameters:
+        fit_pars : [lmfit.Parameters]
+            Parameters to add to, in place.
+        model : [string or function]
+            `'bh'` or :func:`totalvelocity_miniBH <components.totalvelocity_miniBH>` for a halo of tiny black holes, `'wimp'` or :func:`totalvelocity_halo <components.totalvelocity_halo>` for a Dark Matter halo. Anything else adds nothing.
+        galdict_local : [dict]
+            Dictionary of parameters for the galaxy, as returned by :func:`galdict <components.galdict>`.
+    """
+    
+    kind = _halokind(model)
+    
+    # If halo consists of tiny black holes
+    if kind == 'bh':
+        fit_pars.add('arraysize', value=50, min=1, max=100)            # Number of black holes (unitless)
+        fit_pars.add('rho0', value=1.5, min=0)                         # Mass of tiny black holes (:math:`M_{Sun}`)
+    
+    # If halo is Dark Matter halo
+    elif kind == 'wimp':
+        fit_pars.add('arraysize', value=0, vary=False)                  # Scaling factor (unitless)
+        fit_pars.add('rho0', value=galdict_local['rho0'], min=0)        # Halo central density (in solar mass/kpc^3) 
+
 def set_params(model,
                galaxy):
     """
@@ -1046,10 +1363,10 @@ def set_params(model,
     """ 
     
     # Set function model for fitting
-    if type(model) == types.FunctionType:
+    if isinstance(model, types.FunctionType):
         model = lm.Model(model)
         fit_pars = model.make_params()
-    elif type(model) == lm.Model:
+    elif isinstance(model, lm.Model):
         fit_pars = model.make_params()
     else:
         raise ValueError("Invalid type for variable `model`. (",model,", type:",type(model),".)")
@@ -1061,15 +1378,7 @@ def set_params(model,
     fit_pars.add('scale', value=galdict_local['rho0'], vary=False)
     
     # Halo
-    # If halo consists of tiny black holes
-    if (model == 'bh') or (model==lm.Model(totalvelocity_miniBH)) or (model==totalvelocity_miniBH):
-        fit_pars.add('arraysize', value=50, min=1, max=100)            # Number of black holes (unitless)
-        fit_pars.add('rho0', value=1.5, min=0)                         # Mass of tiny black holes (:math:`M_{Sun}`)
-    
-    # If halo is Dark Matter halo
-    elif (model == 'wimp') or (model==lm.Model(totalvelocity_halo)) or (model==totalvelocity_halo):
-        fit_pars.add('arraysize', value=0, vary=False)                  # Scaling factor (unitless)
-        fit_pars.add('rho0', value=galdict_local['rho0'], min=0)        # Halo central density (in solar mass/kpc^3) 
+    _set_halo_params(fit_pars,model,galdict_local)
     fit_pars.add('rcut', value=galdict_local['rc'], min=0.1)            # Cutoff Radius (:math:`kpc`)
     
     # Bulge
@@ -1094,8 +1403,83 @@ def set_params(model,
         
     return fit_pars
 
+# Model for fitting
+def _fitmodel(model,
+              galaxy):
+    """
+    Bind a total velocity model to one galaxy for :func:`bestfit <components.bestfit>`. For :func:`totalvelocity_halo <components.totalvelocity_halo>` and :func:`totalvelocity_miniBH <components.totalvelocity_miniBH>` the galaxy's bulge, disk and gas splines are looked up once here, so that each evaluation during the fit only does the arithmetic.
+
+    :parameters:
+        model : [function]
+            Function used for the fitting, taking the galaxy as its last argument.  
+        galaxy : [string]
+            The galaxy's full name, including catalog, for loading traced curves. Not case-sensitive. Ignores spaces. 
+
+    :returns:
+        [function] The model with arguments `r, scale, arraysize, rho0, rcut, bpref, dpref, gpref, Mbh`.
+    """
+    
+    # Dark matter halo for the known models
+    if model is totalvelocity_halo:
+        darkmatter = lambda r,scale,arraysize,rho0,rcut: halo(r,rcut,rho0)
+    elif model is totalvelocity_miniBH:
+        darkmatter = halo_BH
+    else:
+        return lambda r,scale,arraysize,rho0,rcut,bpref,dpref,gpref,Mbh: model(r,scale,arraysize,rho0,rcut,bpref,dpref,gpref,Mbh,galaxy)
+    
+    # Splines of the unscaled components, with the defaults of bulge, disk and gas
+    galaxy = galaxy.upper().replace(" ","")
+    bulgespline = _bulge_spline(galaxy,n_c,re_c,True,False,'bulge',quadrature_order)
+    diskspline = _disk_spline(galaxy)
+    gasspline = _gas_spline(galaxy)
+    
+    # The fit evaluates the model at the same radii every time, so the squares share one buffer
+    # The result itself is always a new array, since lmfit keeps the returned curves
+    scratch = np.empty(np.shape(galdict(galaxy)['m_radii']))
+    
+    def specialized(r,scale,arraysize,rho0,rcut,bpref,dpref,gpref,Mbh):
+        r = _asradius(r)
+        return _add_in_quadrature([blackhole(r,Mbh),
+                                   bpref*bulgespline(r),
+                                   dpref*diskspline(r),
+                                   darkmatter(r,scale,arraysize,rho0,rcut),
+                                   gpref*gasspline(r)],
+                                  scratch)
+    return specialized
+
+# Weights for fitting
+@lru_cache(maxsize=64)
+def _fit_weights(galaxy,
+                 band):
+    """
+    Build the weights of a fit to the measured velocities once per galaxy, for :func:`bestfit <components.bestfit>`.
+
+    :parameters:
+        galaxy : [string]
+            The galaxy's name, already upper-case and without spaces. 
+        band : [bool]
+            Whether to include the width of the confidence band alongside the measurement errors, when the galaxy has one.
+
+    :returns:
+        [array] Read-only weights, one per measured velocity.
+    """
+    
+    galdict_local = galdict(galaxy)
+    if band:
+        try:
+            weights = 1/np.sqrt(galdict_local['m_v_errors']**2+galdict_local['n_v_bandwidth']**2)
+        except KeyError:                           # If band doesn't exist, don't try to include it.
+            weights = 1/galdict_local['m_v_errors']
+    else:
+        weights = 1/galdict_local['m_v_errors']
+    weights = np.asarray(weights,dtype=float)
+    weights.setflags(write=False)
+    return weights
+
 # Do fit
-def bestfit(model,galaxy):
+def bestfit(model,
+            galaxy,
+            method='leastsq'):
     """
     Calculate fitting.
 
@@ -1104,6 +1488,10 @@ def bestfit(model,galaxy):
             Function used for the fitting.  
         galaxy : [string]
             The galaxy's full name, including catalog, for loading traced curves. Not case-sensitive. Ignores spaces. 
+        method : [string]
+            lmfit minimization method, for example `'least_squares'` for SciPy's Trust Region Reflective solver. 
+
+            :default: `'leastsq'` (Levenberg-Marquardt).
 
     :returns:
         Best fit and dictionary of fitted values.
@@ -1121,40 +1509,64 @@ def bestfit(model,galaxy):
     galdict_local = galdict(galaxy)
     
     # Define new function for fitting
-    newmodel = lambda r,scale,arraysize,rho0,rcut,bpref,dpref,gpref,Mbh: model(r,scale,arraysize,rho0,rcut,bpref,dpref,gpref,Mbh,galaxy)
+    newmodel = _fitmodel(model,galaxy)
     fit_mod = lm.Model(newmodel)
     
     # Set parameters
     fit_pars = set_params(newmodel,galaxy)
     
-    # Define variables
-    # If halo consists of tiny black holes
-    if (model == 'bh') or (model==lm.Model(totalvelocity_miniBH)) or (model==totalvelocity_miniBH):
-        fit_pars.add('arraysize', value=50, min=1, max=100)            # Number of black holes
-        fit_pars.add('rho0', value=1.5, min=0)                         # Mass of tiny black holes (:math:`M_{Sun}`)
-        
-    # If halo is Dark Matter halo
-    elif (model == 'wimp') or (model==lm.Model(totalvelocity_halo)) or (model==totalvelocity_halo):
-        fit_pars.add('arraysize', value=0, vary=False)                  # Scaling factor (unitless)
-        fit_pars.add('rho0', value=galdict_local['rho0'], min=0)        # Halo central density (in solar mass/kpc^3) 
+    # Halo parameters depend on the original model, which set_params only sees wrapped in newmodel
+    _set_halo_params(fit_pars,model,galdict_local)
     
     # Define weights with and without confidence band
-    if model == lm.Model(totalvelocity_halo) or model == totalvelocity_halo:
-        try:
-            weights = 1/np.sqrt(galdict_local['m_v_errors']**2+galdict_local['n_v_bandwidth']**2)
-        except KeyError:                           # If band doesn't exist, don't try to include it.
-            weights = 1/galdict_local['m_v_errors']
-    else:
-        weights = 1/galdict_local['m_v_errors']
-        
-    # Define galaxy
-    galdict_local = galdict(galaxy)
+    band = _halokind(model) == 'wimp'
+    weights = _fit_weights(galaxy.upper().replace(" ",""),band)
     
     # Do fit
-    fit = fit_mod.fit(galdict_local['m_velocities'], fit_pars, r=galdict_local['m_radii'], weights=weights)
+    fit = fit_mod.fit(galdict_local['m_velocities'], fit_pars, r=galdict_local['m_radii'], weights=weights, method=method)
     
     # Define best fit and the dictionary of fitted values
     bestfit = fit.best_fit
     fit_dict = fit.best_values
     
-    return bestfit, fit_dict
\ No newline at end of file
+    return bestfit, fit_dict
+# Do several fits at once
+def bestfit_parallel(model,
+                     galaxies,
+                     n_jobs=-1,
+                     prefer='processes',
+                     method='leastsq'):
+    """
+    Calculate fittings for several galaxies in parallel. Each fit is independent, so they are distributed across workers with joblib.
+
+    :parameters:
+        model : [function]
+            Function used for the fitting. The same model is fitted to every galaxy.
+        galaxies : [list]
+            List of the galaxies' full names, including catalog, for loading traced curves. Not case-sensitive. Ignores spaces. 
+        n_jobs : [int]
+            Number of workers. `-1` uses all available cores.
+            
+            :default: `-1`.
+        prefer : [string]
+            joblib backend preference, `'processes'` or `'threads'`. A fit is mostly Python-level work, so processes usually scale better.
+
+            :default: `'processes'`.
+        method : [string]
+            lmfit minimization method passed to :func:`bestfit <components.bestfit>`.
+
+            :default: `'leastsq'`.
+
+    :returns:
+        [list] Best fit and dictionary of fitted values for each galaxy, in the same order as `galaxies`. See :func:`bestfit <components.bestfit>`.
+        
+    :example:
+        >>> fits = bestfit_parallel(totalvelocity_miniBH,['NGC5533','NGC7814'])
+        >>> for galaxy, (best, fit_dict) in zip(['NGC5533','NGC7814'],fits):
+        >>>     print(galaxy, fit_dict['rcut'])
+    """ 
+    
+    return Parallel(n_jobs=n_jobs, prefer=prefer)(
+        delayed(bestfit)(model,galaxy,method)
+        for galaxy in galaxies
+    )
\ No newline at end of file
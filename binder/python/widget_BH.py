@@ -11,6 +11,8 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from functools import lru_cache
 from ipywidgets import interactive, fixed, FloatSlider, HBox, Layout, Button, Label, Output, VBox
 from IPython.display import display
 import components as comp
@@ -22,7 +24,22 @@ import dataPython as dp
 
 # Import galaxy image
 img = plt.imread("images/A_spiral_snowflake.jpg")            # Import image of NGC 6814
-"""An array of RGB data for a galaxy image (`images/A_spiral_snowflake.jpg`), imported using `matplotlib.pyplot.imread`.
+
+# Extent of the full-resolution image, so that pixel coordinates below refer to it whatever the resolution kept
+imgextent = (-0.5, img.shape[1]-0.5, img.shape[0]-0.5, -0.5)
+"""Position (left, right, bottom, top) of :func:`img <widget_BH.img>` on the plot, in pixels of the full-resolution image.
+
+:type: tuple
+"""
+
+imgstep = 4
+"""Only every `imgstep`-th row and column of the image is kept. The widget shows it a few hundred pixels wide, so the full resolution only costs memory and drawing time.
+
+:type: int
+"""
+
+img = np.ascontiguousarray(img[::imgstep, ::imgstep])  # A copy, so the full-resolution array is freed
+"""An array of RGB data for a galaxy image (`images/A_spiral_snowflake.jpg`), imported using `matplotlib.pyplot.imread` and downsampled by :func:`imgstep <widget_BH.imgstep>`. It is kept as `uint8`.
 
 :type: array
 """
@@ -78,6 +95,54 @@ scale = 1e6                     # scale is neccessary to be a constant, otherwis
 
 :type: int
 """
+# Changing the size of each dot as the mass of the black hole changes
+# Without this the dots would be either too small or too big  
+dotsize = np.linspace(5,12,int(maxmassBH/minmassBH + 1))            # array of sizes from 5 to 12 for dots in scatterplot
+"""Marker sizes for the black hole dots, one per step of the mass slider from :func:`minmassBH <widget_BH.minmassBH>` to :func:`maxmassBH <widget_BH.maxmassBH>`.
+
+:type: array
+"""
+
+def dotindex(massMiniBH):
+    """A function that returns the position of a black hole mass in :func:`dotsize <widget_BH.dotsize>`. 
+    The mass slider moves in steps of :func:`minmassBH <widget_BH.minmassBH>`, so the position follows from the mass directly without searching a table of masses.
+
+    :parameters:
+        massMiniBH : [float]
+            Mass of the tiny black holes, in solar masses.
+
+    :returns: 
+        [int] The index into :func:`dotsize <widget_BH.dotsize>`, limited to its range.
+    """
+    index = int(round((massMiniBH - minmassBH)/minmassBH))
+    return min(max(index,0),len(dotsize)-1)
+
+@lru_cache(maxsize=32)
+def dotpositions(galaxy,arraysize):
+    """A function that places the black hole dots on :func:`img <widget_BH.img>` at random, once per galaxy and number of dots. 
+    The generator is seeded from its arguments, so moving the mass or cutoff radius slider leaves the dots where they are.
+
+    :parameters:
+        galaxy : [string]
+            The galaxy's name, a key of :func:`galaxyparams <widget_BH.galaxyparams>`.
+        arraysize : [int]
+            Number of dots to place.
+
+    :returns: 
+        [tuple] Read-only arrays of the x and y pixel coordinates of the dots.
+    """
+    rng = np.random.default_rng([arraysize,*galaxy.encode()])
+    
+    # Random radii and angles (0 to 360 degrees for full circle), one pair per dot, drawn in a single call
+    radius_trim, angle_trim = rng.uniform((minkpc*kpctopixels,0),(maxkpc*kpctopixels,2*np.pi),(arraysize,2)).T
+    
+    # x and y coordinates for plotting
+    x = center[0] + radius_trim*np.cos(angle_trim)     # x coordinates
+    y = center[1] + radius_trim*np.sin(angle_trim)     # y coordinates
+    x.setflags(write=False)
+    y.setflags(write=False)
+    return x, y
+
 # For number of black holes slider:
 stepN = 5
 """The step size of the slider controlling the number of black holes. In terms of number of black holes represented, this step size is multiplied by the :func:`scale <widget_BH.scale>`.
@@ -85,6 +150,29 @@ stepN = 5
 :int:
 """
 
+galaxyparams = {'NGC5533':{'minnumberBH':50, 'maxnumberBH':5e2, 'defaultnumber':245, 'maxrcutBH':3.0, 'defaultrcutBH':1.4,
+                           'centralblackhole':True, 'xmax':100, 'textx':98},
+                'NGC7814':{'minnumberBH':1, 'maxnumberBH':1000, 'defaultnumber':600, 'maxrcutBH':4.0, 'defaultrcutBH':1.6,
+                           'centralblackhole':False, 'xmax':None, 'textx':19}}
+"""Slider limits and defaults for each galaxy, keyed first by galaxy name and then by the name of the function below that returns the value. 
+The plot settings are `'centralblackhole'`, whether the galaxy's central black hole is fitted and plotted, `'xmax'`, the upper limit of the radius axis (:math:`kpc`, `None` for the largest measured radius), and `'textx'`, the radius at which the reduced :math:`\\chi^2` box ends (:math:`kpc`).
+
+:type: dict
+"""
+
+def galaxykey(galaxy):
+    """A function that turns a galaxy name or NGC number into a key of :func:`galaxyparams <widget_BH.galaxyparams>`.
+
+    :parameters:
+        galaxy : [string | int]
+            The name or number (for NGC) of the selected galaxy. Names are not case-sensitive and ignore spaces. 
+
+    :returns: [string] 
+        The upper-case name without spaces, with `NGC` prepended to a bare number.
+    """
+    name = str(galaxy).upper().replace(" ","")
+    return name if name.startswith('NGC') else 'NGC'+name
+
 def minnumberBH(galaxy):
     """A function that returns the minimum number of black holes (prior to multiplying by the :func:`scale <widget_BH.scale>`) appropriate for the supplied galaxy.
 
@@ -98,10 +186,7 @@ def minnumberBH(galaxy):
     
     .. seealso:: For an example usecase of this function, see :func:`arraysize_5533 <widget_BH.arraysize_5533>`.
     """
-    if str(galaxy) == "5533" or str(galaxy).upper().replace(" ","") == 'NGC5533':
-        return 50
-    elif str(galaxy) == "7814" or str(galaxy).upper().replace(" ","") == 'NGC7814':
-        return 1
+    return galaxyparams.get(galaxykey(galaxy),{}).get('minnumberBH')
     
 def maxnumberBH(galaxy):
     """A function that returns the maximum number of black holes (prior to multiplying by the :func:`scale <widget_BH.scale>`) appropriate for the supplied galaxy.
@@ -116,10 +201,7 @@ def maxnumberBH(galaxy):
     
     .. seealso:: For an example usecase of this function, see :func:`arraysize_5533 <widget_BH.arraysize_5533>`.
     """
-    if str(galaxy) == "5533" or str(galaxy).upper().replace(" ","") == 'NGC5533':
-        return 5e2
-    elif str(galaxy) == "7814" or str(galaxy).upper().replace(" ","") == 'NGC7814':
-        return 1000
+    return galaxyparams.get(galaxykey(galaxy),{}).get('maxnumberBH')
     
 def defaultnumber(galaxy):
     """A function that returns the default number of black holes (prior to multiplying by the :func:`scale <widget_BH.scale>`) appropriate for the supplied galaxy.
@@ -134,10 +216,7 @@ def defaultnumber(galaxy):
     
     .. seealso:: For an example usecase of this function, see :func:`arraysize_5533 <widget_BH.arraysize_5533>`.
     """
-    if str(galaxy) == "5533" or str(galaxy).upper().replace(" ","") == 'NGC5533':
-        return 245
-    elif str(galaxy) == "7814" or str(galaxy).upper().replace(" ","") == 'NGC7814':
-        return 600
+    return galaxyparams.get(galaxykey(galaxy),{}).get('defaultnumber')
 
 #For cutoff radius:
 minrcutBH = 0.1
@@ -159,10 +238,7 @@ def maxrcutBH(galaxy):
     
     .. seealso:: For an example usecase of this function, see :func:`arraysize_5533 <widget_BH.arraysize_5533>`.
     """
-    if str(galaxy) == "5533" or str(galaxy).upper().replace(" ","") == 'NGC5533':
-        return 3.0
-    elif str(galaxy) == "7814" or str(galaxy).upper().replace(" ","") == 'NGC7814':
-        return 4.0
+    return galaxyparams.get(galaxykey(galaxy),{}).get('maxrcutBH')
     
 def defaultrcutBH(galaxy):
     """A function that returns the default cutoff radius for black holes (:math:`kpc`), appropriate for the supplied galaxy.
@@ -177,10 +253,7 @@ def defaultrcutBH(galaxy):
     
     .. seealso:: For an example usecase of this function, see :func:`arraysize_5533 <widget_BH.arraysize_5533>`.
     """
-    if str(galaxy) == "5533" or str(galaxy).upper().replace(" ","") == 'NGC5533':
-        return 1.4
-    elif str(galaxy) == "7814" or str(galaxy).upper().replace(" ","") == 'NGC7814':
-        return 1.6
+    return galaxyparams.get(galaxykey(galaxy),{}).get('defaultrcutBH')
 
     
 style = {'description_width': 'initial'}
@@ -195,125 +268,119 @@ layout = {'width':'800px'}
 :type: dict
 """
 
-####################################
-### Plotting function for widget ###
-####################################
+###############
+### Fitting ###
+###############
 
-### NGC 5533 ###
-def f5533(arraysize,massMiniBH,rcut):
+@lru_cache(maxsize=4)
+def bestfit_values(galaxy):
+    """A function that fits the tiny black hole model to the supplied galaxy once and returns the fitted values on every later call. 
+    The fit does not depend on the slider values, so redrawing the widget does not need to repeat it.
+
+    :parameters:
+        galaxy : [string]
+            The galaxy's full name, including catalog, as accepted by :func:`bestfit <components.bestfit>`.
+
+    :returns: 
+        [dict] The dictionary of fitted values returned by :func:`bestfit <components.bestfit>`. It is shared between calls and should not be modified.
     """
-    Generate a plot of the NGC5533 data and components alongside an image of a galaxy with dots representing black holes.
+    _,fit_dict = comp.bestfit(comp.totalvelocity_miniBH,galaxy)
+    return fit_dict
 
-    This function is intended for use as part of a widget.
+@lru_cache(maxsize=4)
+def static_curves(galaxy):
+    """A function that evaluates, once per galaxy, everything in the rotation curve plot that does not depend on the sliders: the radius grid and the fitted black hole, bulge, disk and gas curves.
 
     :parameters:
-        arraysize: [int]
-            Size intended for the radius and angle arrays.
-        massMiniBH: [int]
-            Mass of the tiny black holes, in solar masses.
-        rcut: [float]
-            Cutoff radius for black hole placement (:math:`kpc`).
-    
-    :returns: 
-        None
+        galaxy : [string]
+            The galaxy's full name, including catalog, as accepted by :func:`bestfit <components.bestfit>`.
 
-    .. seealso:: For an example usage of this function, see the notebook `10_Bonus_Black_Holes_as_DM.ipynb on Binder <https://mybinder.org/v2/gh/villano-lab/galactic-spin-W1/HEAD?labpath=binder%2F10_Bonus_Black_Holes_as_DM.ipynb>`_.
+    :returns: 
+        [dict] Read-only arrays `'r'` (500 radii spanning the measured data, :math:`kpc`), and `'blackhole'`, `'bulge'`, `'disk'` and `'gas'` (:math:`km/s`) on that grid, using the values from :func:`bestfit_values <widget_BH.bestfit_values>`.
     """
-    _,fit_dict = comp.bestfit(comp.totalvelocity_miniBH,'NGC5533')
-    
-    bpref = fit_dict['bpref']
-    dpref = fit_dict['dpref']
-    gpref = fit_dict['gpref']
-    Mbh = fit_dict['Mbh']
+    fit_dict = bestfit_values(galaxy)
+    m_radii = comp.galdict(galaxy)['m_radii']
     
     # Define radius
-    r = np.linspace(
-        np.min(comp.galdict('NGC5533')['m_radii']), 
-        np.max(comp.galdict('NGC5533')['m_radii']),500)
-    
-    # Change input to an integer
-    arraysize = int(arraysize)     # units: dot
-    
-    # Random radii for the galaxy image
-    # Trim to the first x elements (arraysize) of the pre-calculated radius arrays for each bracket
-    rand_radius_5533 = lambda rad1,rad2: np.random.uniform(rad1,rad2,int(maxnumberBH(5533)))
-    radius_trim = rand_radius_5533(minkpc*kpctopixels,maxkpc*kpctopixels)[:arraysize]
-    rand_angle_5533 = np.random.uniform(0,2*np.pi,int(maxnumberBH(5533)))  # angle 0 to 360 degrees for full circle (donut) for each bracket
-    angle_trim = rand_angle_5533[:arraysize]
-    
-    # x and y coordinates for plotting
-    x = center[0] + radius_trim*np.cos(angle_trim)     # x coordinates
-    y = center[1] + radius_trim*np.sin(angle_trim)     # y coordinates
+    r = np.linspace(np.min(m_radii),np.max(m_radii),500)
+    
+    curves = {'r':r,
+              'blackhole':comp.blackhole(r,fit_dict['Mbh']),
+              'bulge':comp.bulge(r,fit_dict['bpref'],galaxy),
+              'disk':comp.disk(r,fit_dict['dpref'],galaxy),
+              'gas':comp.gas(r,fit_dict['gpref'],galaxy)}
+    for curve in curves.values():
+        curve.setflags(write=False)
+    return curves
+
+##############
+### Figure ###
+##############
+
+@lru_cache(maxsize=4)
+def widget_figure(galaxy):
+    """A function that builds the figure of a black hole widget once per galaxy: the galaxy image, the measured data and the curves that do not depend on the sliders, together with empty artists for everything that does. 
+    Redraws then only update those artists instead of creating a new figure, placing the image again and plotting every curve.
+
+    :parameters:
+        galaxy : [string]
+            The galaxy's name, a key of :func:`galaxyparams <widget_BH.galaxyparams>`.
+
+    :returns: 
+        [dict] The `'figure'` (a `matplotlib.figure.Figure` that is not managed by pyplot, so it stays open between redraws) and its slider-dependent artists `'dots'`, `'halo'`, `'total'` and `'chisquared'`.
+    """
+    params = galaxyparams[galaxy]
+    galdict_local = comp.galdict(galaxy)
+    curves = static_curves(galaxy)
+    r = curves['r']
     
-    # Random radii for the plot
-    radius_plot = rand_radius_5533(minkpc,maxkpc)[:arraysize]
-    radius_plot = np.sort(radius_plot)           # sort array
-    radius_plot[0] = 0.2    # first element of the radius should be close to zero because spline function won't plot up to zero
-      
     # Set up two plots next to each other
-    f, (ax1, ax2) = plt.subplots(1, 2, sharey=False)
-    plt.subplots_adjust(wspace=0, hspace=0)
-    f.set_figheight(12)
-    f.set_figwidth(32)
-    
-    # Changing the size of each dot as the mass of the black hole changes
-    # Without this the dots would be either too small or too big  
-    dotsize = np.linspace(5,12,int(maxmassBH/minmassBH + 1))            # array of sizes from 5 to 12 for dots in scatterplot
-    mass = np.round(np.arange(minmassBH,maxmassBH+minmassBH,minmassBH),1)   # array of masses, rounded to 1 decimal
-    loc = np.where(mass == massMiniBH)[0]                           # which element equals to the mBH value, returns position
-    BHsize = dotsize[loc[0]]                                        # picks out a dotsize for that mass
+    f = Figure(figsize=(32,12))
+    ax1, ax2 = f.subplots(1, 2, sharey=False)
+    f.subplots_adjust(wspace=0, hspace=0)
     
     # First plot - image with black holes
-    ax1.plot(x,y, linestyle='none', markerfacecolor='orangered', marker="o", markeredgecolor="maroon", markersize=BHsize)
-    ax1.imshow(img)
+    dots, = ax1.plot([],[], linestyle='none', markerfacecolor='orangered', marker="o", markeredgecolor="maroon")
+    ax1.imshow(img, extent=imgextent)
     ax1.set_title("Each dot representing 1 million tiny black holes.", fontsize=25)
     ax1.set_xlim(0,3970)
     ax1.set_ylim(0,3970)
     ax1.axis('off')
     
     # Second plot - rotation curve   
-    ax2.plot(r,comp.halo_BH(r,scale,arraysize,massMiniBH,rcut),
-             label=("Dark Matter Halo - Tiny Black Holes"),color='green')
-    ax2.errorbar(comp.galdict('NGC5533')['m_radii'],comp.galdict('NGC5533')['m_velocities'],
-                 yerr=comp.galdict('NGC5533')['m_v_errors'],fmt='bo',label='Data')
-    ax2.plot(r,comp.blackhole(r,Mbh,'NGC5533'),label=("Central Black Hole"),color='black')
-    ax2.plot(r,comp.bulge(r,bpref,'NGC5533'),label=("Bulge"),color='orange')
-    ax2.plot(r,comp.disk(r,dpref,'NGC5533'),label=("Disk"),color='purple')
-    ax2.plot(r,comp.gas(r,gpref,'NGC5533'),label=("Gas"),color='blue')
-    ax2.plot(r,comp.totalvelocity_miniBH(r,scale,arraysize,massMiniBH,rcut,
-                                  bpref,dpref,gpref,
-                                  Mbh,'NGC5533'),label=("Total Curve"),color='red')
-    ax2.set_title('NGC 5533',fontsize=40)
+    halo, = ax2.plot(r,np.zeros_like(r),label=("Dark Matter Halo - Tiny Black Holes"),color='green')
+    ax2.errorbar(galdict_local['m_radii'],galdict_local['m_velocities'],yerr=galdict_local['m_v_errors'],fmt='bo',label='Data')
+    if params['centralblackhole']:
+        ax2.plot(r,curves['blackhole'],label=("Central Black Hole"),color='black')
+    ax2.plot(r,curves['bulge'],label=("Bulge"),color='orange')
+    ax2.plot(r,curves['disk'],label=("Disk"),color='purple')
+    ax2.plot(r,curves['gas'],label=("Gas"),color='blue')
+    total, = ax2.plot(r,np.zeros_like(r),label=("Total Curve"),color='red')
+    ax2.set_title(galaxy[:3]+' '+galaxy[3:],fontsize=40)
     ax2.set_ylabel('Velocity [km/s]',fontsize=25)
     ax2.set_xlabel('Radius [kpc]',fontsize=25)
     ax2.tick_params(axis='x', labelsize=16)
     ax2.tick_params(axis='y', labelsize=16)
-    ax2.set_xlim(0,100)
+    ax2.set_xlim(0,params['xmax'] if params['xmax'] is not None else np.max(galdict_local['m_radii']))
     ax2.set_ylim(0,400)
     ax2.legend(bbox_to_anchor=(1,1), loc="upper left", fontsize=20) 
-
-    # Residuals
-    residuals = comp.galdict('NGC5533')['m_velocities'] 
-    - comp.totalvelocity_miniBH(comp.galdict('NGC5533')['m_radii'],
-                                scale,arraysize,massMiniBH,rcut,
-                                                        bpref, dpref, gpref, Mbh,
-                                                        'NGC5533')
-    # Chi squared
-    chisquared = np.sum(residuals**2/comp.galdict('NGC5533')['m_v_errors']**2)
-    dof = len(comp.galdict('NGC5533')['m_radii']) - 6       # number of degrees of freedom = number of observed data - number of fitting parameters
-    reducedchisquared = chisquared / dof
     
     props = dict(boxstyle='round', facecolor='white', alpha=0.5)
-    ax2.text(98,390,r"Reduced $\chi^2$: {:.2f}".format(reducedchisquared),ha='right',va='top',bbox=props,size=22)
-        
-### NGC 7814 ###
-def f7814(arraysize,massMiniBH,rcut):
-    """
-    Generate a plot of the NGC7814 data and components alongside an image of a galaxy with dots representing black holes.
+    chisquared = ax2.text(params['textx'],390,"",ha='right',va='top',bbox=props,size=22)
+    
+    return {'figure':f, 'dots':dots, 'halo':halo, 'total':total, 'chisquared':chisquared}
 
-    This function is intended for use as part of a widget.
+####################################
+### Plotting function for widget ###
+####################################
+
+def plot_galaxy(galaxy,arraysize,massMiniBH,rcut):
+    """
+    Update and show the figure of a black hole widget: the galaxy's data and components alongside an image of a galaxy with dots representing black holes.
 
     :parameters:
+        galaxy: [string]
+            The galaxy's name, a key of :func:`galaxyparams <widget_BH.galaxyparams>`.
         arraysize: [int]
             Size intended for the radius and angle arrays.
         massMiniBH: [int]
@@ -323,92 +390,101 @@ def f7814(arraysize,massMiniBH,rcut):
     
     :returns: 
         None
-
-    .. seealso:: For an example usage of this function, see the notebook `10_Bonus_Black_Holes_as_DM.ipynb on Binder <https://mybinder.org/v2/gh/villano-lab/galactic-spin-W1/HEAD?labpath=binder%2F10_Bonus_Black_Holes_as_DM.ipynb>`__.
     """
-    _,fit_dict = comp.bestfit(comp.totalvelocity_miniBH,'NGC7814')
+    params = galaxyparams[galaxy]
+    fit_dict = bestfit_values(galaxy)
+    
+    # Measured data
+    galdict_local = comp.galdict(galaxy)
+    m_radii = galdict_local['m_radii']
+    m_velocities = galdict_local['m_velocities']
+    m_v_errors = galdict_local['m_v_errors']
     
     bpref = fit_dict['bpref']
     dpref = fit_dict['dpref']
     gpref = fit_dict['gpref']
+    Mbh = fit_dict['Mbh'] if params['centralblackhole'] else 0
     
-    # Define radius
-    r = np.linspace(
-        np.min(comp.galdict('NGC7814')['m_radii']),
-        np.max(comp.galdict('NGC7814')['m_radii']),500)
+    # Figure with everything that does not depend on the sliders
+    artists = widget_figure(galaxy)
+    r = static_curves(galaxy)['r']
     
     # Change input to an integer
     arraysize = int(arraysize)     # units: dot
     
-    # Random radii for the galaxy image
-    # Trim to the first x elements (arraysize) of the pre-calculated radius arrays for each bracket
-    rand_radius_7814 = lambda rad1,rad2: np.random.uniform(rad1,rad2,int(maxnumberBH(7814)))
-    radius_trim = rand_radius_7814(minkpc*kpctopixels,maxkpc*kpctopixels)[:arraysize]
-    rand_angle_7814 = np.random.uniform(0,2*np.pi,int(maxnumberBH(7814)))  # angle 0 to 360 degrees for full circle (donut) for each bracket
-    angle_trim = rand_angle_7814[:arraysize]
-    
-    # x and y coordinates for plotting
-    x = center[0] + radius_trim*np.cos(angle_trim)     # x coordinates
-    y = center[1] + radius_trim*np.sin(angle_trim)     # y coordinates
-    
-    # Random radii for the plot
-    radius_plot = rand_radius_7814(minkpc,maxkpc)[:arraysize]
-    radius_plot = np.sort(radius_plot)           # sort array
-    radius_plot[0] = 0.2    # first element of the radius should be close to zero because spline function won't plot up to zero
-      
-    # Set up two plots next to each other
-    f, (ax3, ax4) = plt.subplots(1, 2, sharey=False)
-    plt.subplots_adjust(wspace=0, hspace=0)
-    f.set_figheight(12)
-    f.set_figwidth(32)
+    # Dot positions on the galaxy image, only drawn again when the number of dots changes
+    x, y = dotpositions(galaxy,arraysize)
     
     # Changing the size of each dot as the mass of the black hole changes
     # Without this the dots would be either too small or too big  
-    dotsize = np.linspace(5,12,int(maxmassBH/minmassBH + 1))            # array of sizes from 5 to 12 for dots in scatterplot
-    mass = np.round(np.arange(minmassBH,maxmassBH+minmassBH,minmassBH),1)   # array of masses, rounded to 1 decimal
-    loc = np.where(mass == massMiniBH)[0]                           # which element equals to the mBH value, returns position
-    BHsize = dotsize[loc[0]]                                        # picks out a dotsize for that mass
+    BHsize = dotsize[dotindex(massMiniBH)]                          # picks out a dotsize for that mass
     
     # First plot - image with black holes
-    ax3.plot(x,y, linestyle='none', markerfacecolor='orangered', marker="o", 
-             markeredgecolor="maroon", markersize=BHsize)
-    ax3.imshow(img)
-    ax3.set_title("Each dot representing 1 million tiny black holes.", fontsize=25)
-    ax3.set_xlim(0,3970)
-    ax3.set_ylim(0,3970)
-    ax3.axis('off')
+    artists['dots'].set_data(x,y)
+    artists['dots'].set_markersize(BHsize)
     
     # Second plot - rotation curve   
-    ax4.plot(r,comp.halo_BH(r,scale,arraysize,massMiniBH,rcut),
-             label=("Dark Matter Halo - Tiny Black Holes"),color='green')
-    ax4.errorbar(comp.galdict('NGC7814')['m_radii'],
-                 comp.galdict('NGC7814')['m_velocities'],yerr=comp.galdict('NGC7814')['m_v_errors'],fmt='bo',label='Data')
-    ax4.plot(r,comp.bulge(r,bpref,'NGC7814'),label=("Bulge"),color='orange')
-    ax4.plot(r,comp.disk(r,dpref,'NGC7814'),label=("Disk"),color='purple')
-    ax4.plot(r,comp.gas(r,gpref,'NGC7814'),label=("Gas"),color='blue')
-    ax4.plot(r,comp.totalvelocity_miniBH(r,scale,arraysize,massMiniBH,
-                                                  rcut,bpref,dpref,
-                                                  gpref,0,'NGC7814'),label=("Total Curve"),color='red')
-    ax4.set_title('NGC 7814',fontsize=40)
-    ax4.set_ylabel('Velocity [km/s]',fontsize=25)
-    ax4.set_xlabel('Radius [kpc]',fontsize=25)
-    ax4.tick_params(axis='x', labelsize=16)
-    ax4.tick_params(axis='y', labelsize=16)
-    ax4.set_xlim(0,np.max(comp.galdict('NGC7814')['m_radii']))
-    ax4.set_ylim(0,400)
-    ax4.legend(bbox_to_anchor=(1,1), loc="upper left", fontsize=20) 
+    artists['halo'].set_ydata(comp.halo_BH(r,scale,arraysize,massMiniBH,rcut))
+    artists['total'].set_ydata(comp.totalvelocity_miniBH(r,scale,arraysize,massMiniBH,rcut,
+                                                         bpref,dpref,gpref,
+                                                         Mbh,galaxy))
 
     # Residuals
-    residuals = comp.galdict('NGC7814')['m_velocities'] - comp.totalvelocity_miniBH(
-        comp.galdict('NGC7814')['m_radii'], 
-        scale,arraysize,massMiniBH,rcut, bpref, dpref, gpref, 0, 'NGC7814')
+    residuals = m_velocities - comp.totalvelocity_miniBH(m_radii,
+                                                         scale,arraysize,massMiniBH,rcut,
+                                                         bpref,dpref,gpref,Mbh,
+                                                         galaxy)
     # Chi squared
-    chisquared = np.sum(residuals**2/comp.galdict('NGC7814')['m_v_errors']**2)
-    dof = len(comp.galdict('NGC5533')['m_radii']) - 5       # number of degrees of freedom = number of observed data - number of fitting parameters
-    reducedchisquared = chisquared / dof  
+    chisquared = np.sum((residuals/m_v_errors)**2)
+    dof = len(m_radii) - (6 if params['centralblackhole'] else 5)      # number of degrees of freedom = number of observed data - number of fitting parameters
+    reducedchisquared = chisquared / dof
     
-    props = dict(boxstyle='round', facecolor='white', alpha=0.5)
-    ax4.text(19,390,r"Reduced $\chi^2$: {:.2f}".format(reducedchisquared),ha='right',va='top',bbox=props,size=22)
+    artists['chisquared'].set_text(r"Reduced $\chi^2$: {:.2f}".format(reducedchisquared))
+    display(artists['figure'])
+
+### NGC 5533 ###
+def f5533(arraysize,massMiniBH,rcut):
+    """
+    Generate a plot of the NGC5533 data and components alongside an image of a galaxy with dots representing black holes.
+
+    This function is intended for use as part of a widget.
+
+    :parameters:
+        arraysize: [int]
+            Size intended for the radius and angle arrays.
+        massMiniBH: [int]
+            Mass of the tiny black holes, in solar masses.
+        rcut: [float]
+            Cutoff radius for black hole placement (:math:`kpc`).
+    
+    :returns: 
+        None
+
+    .. seealso:: For an example usage of this function, see the notebook `10_Bonus_Black_Holes_as_DM.ipynb on Binder <https://mybinder.org/v2/gh/villano-lab/galactic-spin-W1/HEAD?labpath=binder%2F10_Bonus_Black_Holes_as_DM.ipynb>`_.
+    """
+    plot_galaxy('NGC5533',arraysize,massMiniBH,rcut)
+        
+### NGC 7814 ###
+def f7814(arraysize,massMiniBH,rcut):
+    """
+    Generate a plot of the NGC7814 data and components alongside an image of a galaxy with dots representing black holes.
+
+    This function is intended for use as part of a widget.
+
+    :parameters:
+        arraysize: [int]
+            Size intended for the radius and angle arrays.
+        massMiniBH: [int]
+            Mass of the tiny black holes, in solar masses.
+        rcut: [float]
+            Cutoff radius for black hole placement (:math:`kpc`).
+    
+    :returns: 
+        None
+
+    .. seealso:: For an example usage of this function, see the notebook `10_Bonus_Black_Holes_as_DM.ipynb on Binder <https://mybinder.org/v2/gh/villano-lab/galactic-spin-W1/HEAD?labpath=binder%2F10_Bonus_Black_Holes_as_DM.ipynb>`__.
+    """
+    plot_galaxy('NGC7814',arraysize,massMiniBH,rcut)
     
 ################################
 ######## Define Sliders ########
@@ -422,6 +498,7 @@ arraysize_5533 = FloatSlider(min=minnumberBH(5533), max=maxnumberBH(5533), step=
                 readout=True,
                 readout_format='.2d', 
                 orientation='horizontal', 
+                continuous_update=False,
                 style=style, layout=layout)
 """Slider for controlling the number of black holes for NGC5533.
 
@@ -435,6 +512,7 @@ massMiniBH_5533 = FloatSlider(min=minmassBH, max=maxmassBH, step=minmassBH,
                 readout=True,
                 readout_format='.1f',
                 orientation='horizontal', 
+                continuous_update=False,
                 style=style, layout=layout)
 """Slider for controlling the black hole mass for NGC5533.
 
@@ -448,6 +526,7 @@ rcut_5533 = FloatSlider(min=minrcutBH, max=maxrcutBH(5533), step=minrcutBH,
                 readout=True,
                 readout_format='.1f',
                 orientation='horizontal', 
+                continuous_update=False,
                 style=style, layout=layout)
 """Slider for controlling the cutoff radius for black hole placement for NGC5533.
 
@@ -462,6 +541,7 @@ arraysize_7814 = FloatSlider(min=minnumberBH(7814), max=maxnumberBH(7814), step=
                 readout=True,
                 readout_format='.2d', 
                 orientation='horizontal', 
+                continuous_update=False,
                 style=style, layout=layout)
 """Slider for controlling the number of black holes for NGC7814.
 
@@ -475,6 +555,7 @@ massMiniBH_7814 = FloatSlider(min=minmassBH, max=maxmassBH, step=minmassBH,
                 readout=True,
                 readout_format='.1f',
                 orientation='horizontal', 
+                continuous_update=False,
                 style=style, layout=layout)
 """Slider for controlling the black hole mass for NGC7814.
 
@@ -488,6 +569,7 @@ rcut_7814 = FloatSlider(min=minrcutBH, max=maxrcutBH(7814), step=minrcutBH,
                 readout=True,
                 readout_format='.1f',
                 orientation='horizontal', 
+                continuous_update=False,
                 style=style, layout=layout)
 """Slider for controlling the cutoff radius for black hole placement for NGC7814.
 